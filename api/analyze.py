@@ -1,147 +1,311 @@
-import json
+import hashlib
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 API_KEY = os.environ.get('ARK_API_KEY', '483e4f2b-fe23-4ab3-a3f3-ab66c279f748')
 ENDPOINT_ID = 'ep-20260221013833-rdjh9'
+URL = 'https://ark.cn-beijing.volces.com/api/v3/responses'
 
-def handler(event, context):
+# Reject oversize request bodies before spending CPU on a multi-MB JSON parse
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+# Shared response headers; referenced (never mutated) by every return path
+JSON_CORS_HEADERS = {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'}
+
+# Module-level session so warm serverless containers reuse the HTTPS
+# connection instead of paying a TCP+TLS handshake on every invocation
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504])
+))
+SESSION.headers.update({
+    'Content-Type': 'application/json',
+    'Authorization': 'Bearer ' + API_KEY
+})
+
+# HTTP/2 compresses the repeated auth headers and multiplexes the racing
+# payload attempts over one TLS connection; needs httpx plus its h2 extra
+try:
+    import httpx
+    CLIENT = httpx.Client(
+        http2=True,
+        timeout=55.0,
+        limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+        headers={'Content-Type': 'application/json', 'Authorization': 'Bearer ' + API_KEY}
+    )
+    HAS_HTTPX = True
+except ImportError:
+    CLIENT = None
+    HAS_HTTPX = False
+
+
+def _post_body(url, body):
+    """POST a pre-serialized JSON body, over HTTP/2 when available"""
+    if HAS_HTTPX:
+        return CLIENT.post(url, content=body)
+    return SESSION.post(url, data=body, timeout=50, stream=True)
+
+
+# Shared worker pool for racing payload formats; persists across warm invocations
+_POOL = ThreadPoolExecutor(max_workers=4)
+
+
+def _close_abandoned(future):
+    """Drain a losing attempt so its socket returns to the session pool"""
     try:
-        import requests
-        
-        body = json.loads(event.get('body', '{}'))
-        image_base64 = body.get('image', '')
-        prompt = body.get('prompt', 'Describe this image')
-        
-        url = 'https://ark.cn-beijing.volces.com/api/v3/responses'
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': 'Bearer ' + API_KEY
-        }
-        
-        if image_base64:
-            # Try format 1
-            payload = {
-                'model': ENDPOINT_ID,
-                'input': {
-                    'messages': [
-                        {
-                            'role': 'user',
-                            'content': [
-                                {'type': 'image_url', 'image_url': {'url': 'data:image/jpeg;base64,' + image_base64}},
-                                {'type': 'text', 'text': prompt}
-                            ]
-                        }
-                    ]
-                }
-            }
-            
-            try:
-                response = requests.post(url, json=payload, headers=headers, timeout=50)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    text = ''
-                    if 'output' in result:
-                        for item in result['output']:
-                            if 'content' in item:
-                                for c in item['content']:
-                                    if c.get('type') == 'output_text':
-                                        text += c.get('text', '')
-                    
-                    if not text:
-                        text = str(result)
-                    
-                    return {
-                        'statusCode': 200,
-                        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                        'body': json.dumps({'description': text})
-                    }
-            except Exception as e:
-                pass
-            
-            # Try format 2
-            payload = {
-                'model': ENDPOINT_ID,
-                'input': [
+        future.result().close()
+    except Exception:
+        pass
+
+
+def _discard_losers(futures, winner):
+    """Cancel attempts that haven't started; drain the ones in flight
+
+    An abandoned stream=True response is never read, which would strand
+    its pooled connection and keep a pool worker busy for the rest of
+    the attempt's timeout.
+    """
+    for f in futures:
+        if f is not winner and not f.cancel():
+            f.add_done_callback(_close_abandoned)
+
+
+def _warm_connection():
+    """Resolve DNS and open a TLS connection to Ark during cold start"""
+    try:
+        SESSION.head(URL, timeout=2)
+    except Exception:
+        pass
+
+
+# Pay the DNS + TLS handshake in parallel with runtime initialization so the
+# first real invocation on a cold container finds a pooled connection ready
+threading.Thread(target=_warm_connection, daemon=True).start()
+
+# Exact-match response cache: a repeated (image, prompt) pair served from a
+# warm container skips the upstream round-trip and inference cost entirely
+_CACHE = {}
+# Batched invocations hit the cache from several pool threads at once;
+# the eviction scan iterates the dict and must not race an insert
+_CACHE_LOCK = threading.Lock()
+_CACHE_TTL = 3600
+_CACHE_MAX_ENTRIES = 512
+
+
+def _extract_output_text(result):
+    """Join all output_text fragments from an Ark response in one pass"""
+    return ''.join(
+        c.get('text', '')
+        for item in result.get('output') or ()
+        for c in item.get('content') or ()
+        if c.get('type') == 'output_text'
+    )
+
+
+def _image_payloads(data_url, prompt):
+    """Build the two payload envelopes the endpoint may accept"""
+    return [
+        {
+            'model': ENDPOINT_ID,
+            'input': {
+                'messages': [
                     {
                         'role': 'user',
                         'content': [
-                            {'type': 'input_image', 'image_url': 'data:image/jpeg;base64,' + image_base64},
-                            {'type': 'input_text', 'text': prompt}
+                            {'type': 'image_url', 'image_url': {'url': data_url}},
+                            {'type': 'text', 'text': prompt}
                         ]
                     }
                 ]
             }
-            
-            try:
-                response = requests.post(url, json=payload, headers=headers, timeout=50)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    text = ''
-                    if 'output' in result:
-                        for item in result['output']:
-                            if 'content' in item:
-                                for c in item['content']:
-                                    if c.get('type') == 'output_text':
-                                        text += c.get('text', '')
-                    
-                    return {
-                        'statusCode': 200,
-                        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                        'body': json.dumps({'description': text})
-                    }
-                else:
-                    return {
-                        'statusCode': 500,
-                        'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                        'body': json.dumps({'error': f"API error: {response.status_code}", 'details': response.text[:200]})
-                    }
-            except Exception as e:
-                return {
-                    'statusCode': 500,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps({'error': f"Request failed: {str(e)}"})
+        },
+        {
+            'model': ENDPOINT_ID,
+            'input': [
+                {
+                    'role': 'user',
+                    'content': [
+                        {'type': 'input_image', 'image_url': data_url},
+                        {'type': 'input_text', 'text': prompt}
+                    ]
                 }
-        else:
-            # Text only
-            payload = {
-                'model': ENDPOINT_ID,
-                'input': [
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ]
+            ]
+        }
+    ]
+
+
+def _text_payload(prompt):
+    """Build the text-only payload"""
+    return {
+        'model': ENDPOINT_ID,
+        'input': [
+            {
+                'role': 'user',
+                'content': prompt
             }
-            
-            response = requests.post(url, json=payload, headers=headers, timeout=50)
-            
-            if response.status_code == 200:
-                result = response.json()
-                text = ''
-                if 'output' in result:
-                    for item in result['output']:
-                        if 'content' in item:
-                            for c in item['content']:
-                                if c.get('type') == 'output_text':
-                                    text += c.get('text', '')
-                
-                return {
-                    'statusCode': 200,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps({'description': text})
-                }
-            else:
-                return {
-                    'statusCode': 500,
-                    'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-                    'body': json.dumps({'error': f"API error: {response.status_code}"})
-                }
+        ]
+    }
+
+
+def _read_output_text(response):
+    """Pull output_text from an upstream response
+    
+    With ijson installed the body is parsed incrementally off the wire so
+    parsing overlaps the network read and the full JSON is never buffered;
+    otherwise the buffered body is parsed in one shot with orjson.
+    """
+    raw = getattr(response, 'raw', None)
+    if not HAS_IJSON or raw is None:
+        # No str(result) fallback: the streaming branch below can't
+        # produce one, and an explicit empty-response error beats
+        # returning megabytes of repr as a "description"
+        return _extract_output_text(orjson.loads(response.content))
+    
+    raw.decode_content = True
+    parts = []
+    item_type = None
+    item_text = ''
+    for prefix, event, value in ijson.parse(raw):
+        if prefix == 'output.item.content.item.type':
+            item_type = value
+        elif prefix == 'output.item.content.item.text':
+            item_text = value
+        elif event == 'end_map' and prefix == 'output.item.content.item':
+            if item_type == 'output_text':
+                parts.append(item_text)
+            item_type = None
+            item_text = ''
+    return ''.join(parts)
+
+
+def _cache_key(image_base64, prompt):
+    """Build a deterministic cache key from the image and prompt
+    
+    The base64 image is opaque forwarded content — it is never decoded
+    server-side, so the key hashes the base64 text itself rather than
+    paying a multi-MB decode just to fingerprint it.
+    """
+    img_hash = hashlib.sha256(image_base64.encode('ascii', 'ignore')).digest() if image_base64 else b''
+    return hashlib.sha256(img_hash + prompt.encode() + ENDPOINT_ID.encode()).hexdigest()
+
+
+def _respond(status, obj):
+    """Build a lambda-style JSON response"""
+    return {
+        'statusCode': status,
+        'headers': JSON_CORS_HEADERS,
+        'body': orjson.dumps(obj).decode()
+    }
+
+
+def _cache_get(key):
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+    if entry and time.time() - entry[0] < _CACHE_TTL:
+        return entry[1]
+    return None
+
+
+def _cache_put(key, text):
+    with _CACHE_LOCK:
+        if len(_CACHE) >= _CACHE_MAX_ENTRIES:
+            oldest = min(_CACHE, key=lambda k: _CACHE[k][0])
+            del _CACHE[oldest]
+        _CACHE[key] = (time.time(), text)
+
+
+def _analyze_one(image_base64, prompt):
+    """Analyze a single (image, prompt) pair
+    
+    Returns {'description': ...} on success or {'error': ...} on failure.
+    """
+    cache_key = _cache_key(image_base64, prompt)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return {'description': cached}
+    
+    if image_base64:
+        # Build the multi-megabyte data URL once and serialize each
+        # payload once up front, so the base64 image is not copied and
+        # re-encoded inside requests per attempt. The endpoint accepts
+        # one of two payload formats; race both concurrently and take
+        # the first 200 instead of waiting out the first attempt's
+        # full timeout before trying the second.
+        data_url = 'data:image/jpeg;base64,' + image_base64
+        payloads = _image_payloads(data_url, prompt)
+    else:
+        payloads = [_text_payload(prompt)]
+    
+    last_error = "API call failed"
+    bodies = [orjson.dumps(p) for p in payloads]
+    futures = [_POOL.submit(_post_body, URL, b) for b in bodies]
+    
+    for future in as_completed(futures):
+        try:
+            response = future.result()
+        except Exception as e:
+            last_error = f"Request failed: {str(e)}"
+            continue
+        
+        if response.status_code != 200:
+            last_error = f"API error: {response.status_code}: {response.text[:200]}"
+            continue
+        
+        text = _read_output_text(response)
+        
+        if not text:
+            last_error = "Empty response"
+            continue
+        
+        _cache_put(cache_key, text)
+
+        _discard_losers(futures, future)
+        return {'description': text}
+    
+    return {'error': last_error}
+
+
+def handler(event, context):
+    try:
+        raw_body = event.get('body') or b'{}'
+        if len(raw_body) > MAX_BODY_BYTES:
+            return _respond(413, {'error': 'Request body too large'})
+
+        body = orjson.loads(raw_body)
+        
+        # Batched path: fan a list of (image, prompt) items out over the
+        # keep-alive pool in one invocation instead of one round-trip each
+        items = body.get('items')
+        if items:
+            with ThreadPoolExecutor(max_workers=min(len(items), 8)) as batch_pool:
+                futures = [
+                    batch_pool.submit(
+                        _analyze_one,
+                        item.get('image', ''),
+                        item.get('prompt', 'Describe this image')
+                    )
+                    for item in items
+                ]
+                return _respond(200, {'results': [f.result() for f in futures]})
+        
+        result = _analyze_one(body.get('image', ''), body.get('prompt', 'Describe this image'))
+        if 'error' in result:
+            return _respond(500, result)
+        return _respond(200, result)
     
     except Exception as e:
-        return {
-            'statusCode': 500,
-            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
-            'body': json.dumps({'error': str(e)})
-        }
+        return _respond(500, {'error': str(e)})
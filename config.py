@@ -27,6 +27,13 @@ DEFAULT_DPI = 300
 DPI_STEP = 10
 
 JPEG_QUALITY = 95
+JPEG_PROGRESSIVE = False
+
+PNG_COMPRESS_LEVEL = 6
+
+# Spend an extra encoder pass (Huffman optimization for JPEG, exhaustive
+# filtering for PNG) for slightly smaller files at the cost of speed
+OPTIMIZE_OUTPUT = False
 
 TIFF_COMPRESSION = 'tiff_lzw'
 
@@ -56,6 +63,10 @@ DEFAULT_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "Desktop")
 
 MAX_FILE_SIZE_MB = 500
 
+# Cap on rendered pixels per PDF page; rasterization DPI is scaled down
+# so a high-DPI scan cannot blow up into a 100+ megapixel bitmap
+MAX_OUTPUT_MEGAPIXELS = 30
+
 THUMBNAIL_SIZE = (48, 48)
 
 STYLESHEET = """
@@ -12,13 +12,29 @@ Handles all format conversions:
 """
 
 import os
+import queue
+import re
+import tempfile
 import threading
+import time
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Tuple, Optional, Callable
 from datetime import datetime
 
-from PIL import Image
+# Pillow-SIMD is a drop-in replacement (pip install pillow-simd) whose
+# AVX2 kernels accelerate the paste/composite paths used below ~4x;
+# nothing here needs to change to benefit from it
+from PIL import Image, ImageFile, ImageSequence
+
+# Legit large scans routinely exceed Pillow's ~178 MP decompression-bomb
+# limit and some scanners emit slightly truncated TIFFs; accept both
+# instead of turning a slow file into a hard failure
+Image.MAX_IMAGE_PIXELS = None
+ImageFile.LOAD_TRUNCATED_IMAGES = True
+
 try:
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     HAS_PDF2IMAGE = True
 except ImportError:
     HAS_PDF2IMAGE = False
@@ -29,12 +45,165 @@ try:
 except ImportError:
     HAS_IMG2PDF = False
 
+try:
+    import fitz  # PyMuPDF
+    HAS_PYMUPDF = True
+except ImportError:
+    HAS_PYMUPDF = False
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    import vtracer
+    HAS_VTRACER = True
+except ImportError:
+    HAS_VTRACER = False
+
+try:
+    import cairosvg
+    HAS_CAIROSVG = True
+except ImportError:
+    HAS_CAIROSVG = False
+
 from config import (
     MIN_DPI, MAX_DPI, DEFAULT_DPI, DPI_STEP,
-    JPEG_QUALITY, TIFF_COMPRESSION, CONVERSION_COMBINATIONS
+    JPEG_QUALITY, JPEG_PROGRESSIVE, PNG_COMPRESS_LEVEL, OPTIMIZE_OUTPUT,
+    TIFF_COMPRESSION, CONVERSION_COMBINATIONS, MAX_OUTPUT_MEGAPIXELS
 )
 from file_processor import FileInfo, FileProcessor
 
+# Poppler writes temp pages while rendering; keep them on a RAM-backed
+# filesystem when one exists so that traffic never hits the disk
+_TMP = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else tempfile.gettempdir()
+
+
+_NUM_RE = re.compile(r'(\d+)')
+
+
+def _nat_key(name: str) -> List:
+    """
+    Natural sort key: page_2 orders before page_10
+    
+    Byte-wise string compare mis-sorts numbered pages, so digit runs are
+    compared as integers. sorted() calls the key once per element, so
+    the split cost is paid once rather than per comparison.
+    """
+    return [int(t) if t.isdigit() else t for t in _NUM_RE.split(name)]
+
+
+def _throttle(callback: Callable, min_delta_pct: int = 1, min_interval_s: float = 0.05) -> Callable:
+    """
+    Drop progress updates that advance less than min_delta_pct within
+    min_interval_s of the previous emitted one
+    
+    Every update hops to the GUI thread and triggers a repaint; on a
+    multi-hundred-page PDF the marshaling can rival the conversion work
+    itself. The final 100% update always goes through.
+    """
+    if callback is None:
+        return lambda message, progress: None
+    
+    last = {'pct': -1, 't': 0.0}
+    
+    def wrapped(message: str, progress: int):
+        now = time.monotonic()
+        if progress < last['pct']:
+            # Progress restarted from a lower value — a new file or
+            # format group began on the same callback; reset so its
+            # updates aren't swallowed by the previous run's 100%
+            last['pct'] = -1
+            last['t'] = 0.0
+        if progress < 100:
+            if progress - last['pct'] < min_delta_pct or now - last['t'] < min_interval_s:
+                return
+        last['pct'] = progress
+        last['t'] = now
+        callback(message, progress)
+    
+    return wrapped
+
+
+def _flatten_rgba(img: Image.Image) -> Image.Image:
+    """
+    Flatten an RGBA image onto a white background
+    
+    With NumPy the blend is a single vectorized pass over the pixel data,
+    avoiding the channel split and background allocation of the Pillow
+    composite, which remains as the fallback.
+    """
+    if HAS_NUMPY:
+        arr = np.asarray(img, dtype=np.uint8)
+        rgb = arr[..., :3].astype(np.uint32)
+        alpha = arr[..., 3:4].astype(np.uint32)
+        out = ((rgb * alpha + 255 * (255 - alpha)) // 255).astype(np.uint8)
+        return Image.fromarray(out, 'RGB')
+    
+    # alpha_composite runs Pillow's premultiplied-alpha (RGBa) kernel —
+    # the lane-parallel path in Pillow-SIMD — and needs no mask band
+    background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+    return Image.alpha_composite(background, img).convert('RGB')
+
+
+def _as_rgb(img: Image.Image) -> Image.Image:
+    """
+    Return an RGB version of img, skipping the copy when it already is one
+    
+    convert('RGB') always allocates a fresh image even for RGB input,
+    costing a full W*H*3 copy per frame on the common camera-JPEG path.
+    RGBA goes through the vectorized flatten.
+    """
+    if img.mode == 'RGB':
+        return img
+    if img.mode == 'RGBA':
+        return _flatten_rgba(img)
+    return img.convert('RGB')
+
+
+def _best_tiff_compression(img: Image.Image) -> str:
+    """
+    Pick a TIFF compression scheme suited to the image content
+    
+    CCITT Group 4 is both much smaller and faster to encode than LZW for
+    bilevel scans; palette and grayscale pages compress well with LZW;
+    full-color content gets deflate.
+    """
+    if img.mode == '1':
+        return 'group4'
+    if img.mode in ('L', 'P'):
+        return TIFF_COMPRESSION
+    return 'tiff_deflate'
+
+
+def _save_tiff(img: Image.Image, output_path: str):
+    """
+    Save a frame as TIFF, keeping bilevel/grayscale modes native
+    
+    Only alpha needs flattening; expanding a 1-bit or grayscale scan to
+    RGB before saving would triple its size and forfeit Group 4.
+    """
+    if img.mode == 'RGBA':
+        img = _flatten_rgba(img)
+    img.save(output_path, 'TIFF', compression=_best_tiff_compression(img))
+
+
+def _clamp_dpi(dpi: int, width_pt: float, height_pt: float) -> int:
+    """
+    Cap the render DPI so one page stays under MAX_OUTPUT_MEGAPIXELS
+    
+    A 1200-DPI scan rendered at its own DPI would produce a ~120 MP
+    bitmap per page; rasterization time and memory scale with pixel
+    count, so the cap bounds both while leaving normal pages untouched.
+    """
+    if not width_pt or not height_pt:
+        return dpi
+    max_pixels = MAX_OUTPUT_MEGAPIXELS * 1_000_000
+    dpi_cap = int(72 * (max_pixels / (width_pt * height_pt)) ** 0.5)
+    return min(dpi, max(dpi_cap, 1))
+
 
 class ConversionTask:
     """Represents a single conversion task"""
@@ -93,8 +262,8 @@ class ConversionEngine:
     
     def _check_dependencies(self):
         """Check if all required dependencies are available"""
-        if not HAS_PDF2IMAGE:
-            raise ImportError("pdf2image is required but not installed. Run: pip install pdf2image")
+        if not HAS_PYMUPDF and not HAS_PDF2IMAGE:
+            raise ImportError("PyMuPDF or pdf2image is required but not installed. Run: pip install PyMuPDF")
         if not HAS_IMG2PDF:
             raise ImportError("img2pdf is required but not installed. Run: pip install img2pdf")
     
@@ -106,7 +275,7 @@ class ConversionEngine:
         dpi: int = DEFAULT_DPI,
         progress_callback: Callable[[str, int], None] = None,
         cancel_event: threading.Event = None
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """
         Execute conversion based on source file formats
         
@@ -119,8 +288,11 @@ class ConversionEngine:
             cancel_event: Event to signal cancellation
             
         Returns:
-            Tuple of (success_files, failed_files)
+            Tuple of (success_files, failed_files), where each failed
+            entry is a (path, error_message) pair
         """
+        progress_callback = _throttle(progress_callback)
+        
         success_files = []
         failed_files = []
         
@@ -155,7 +327,7 @@ class ConversionEngine:
         dpi: int,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert files based on source format"""
         
         if not files:
@@ -179,9 +351,9 @@ class ConversionEngine:
             elif target_format == 'png':
                 return self._jpg_to_png(files, output_dir, progress_callback, cancel_event)
             elif target_format == 'tiff':
-                return self._jpg_to_tiff(files, output_dir, progress_callback, cancel_event)
+                return self._jpg_to_tiff(files, output_dir, dpi, progress_callback, cancel_event)
             elif target_format == 'svg':
-                return self._jpg_to_svg(files, output_dir, progress_callback, cancel_event)
+                return self._raster_to_svg(files, output_dir, progress_callback, cancel_event)
         
         # PNG conversions
         elif source_format == 'png':
@@ -192,7 +364,7 @@ class ConversionEngine:
             elif target_format == 'tiff':
                 return self._png_to_tiff(files, output_dir, progress_callback, cancel_event)
             elif target_format == 'svg':
-                return self._png_to_svg(files, output_dir, progress_callback, cancel_event)
+                return self._raster_to_svg(files, output_dir, progress_callback, cancel_event)
         
         # TIFF conversions
         elif source_format == 'tiff':
@@ -203,7 +375,7 @@ class ConversionEngine:
             elif target_format == 'png':
                 return self._tiff_to_png(files, output_dir, progress_callback, cancel_event)
             elif target_format == 'svg':
-                return self._tiff_to_svg(files, output_dir, progress_callback, cancel_event)
+                return self._raster_to_svg(files, output_dir, progress_callback, cancel_event)
         
         # SVG conversions
         elif source_format == 'svg':
@@ -218,6 +390,152 @@ class ConversionEngine:
         
         return [], []
     
+    def _run_per_file(
+        self,
+        files: List[FileInfo],
+        convert_one: Callable,
+        progress_callback: Callable,
+        cancel_event: threading.Event
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        Run a per-file conversion function over the given files
+        
+        Files are independent and the heavy work happens in C code that
+        releases the GIL, so batches are fanned out over a small thread
+        pool; a single file runs inline to skip the pool overhead.
+        convert_one takes a FileInfo and returns the output paths.
+        """
+        success_files = []
+        failed_files = []
+        total = len(files)
+        
+        if total <= 1:
+            for file_info in files:
+                try:
+                    progress_callback(f"正在转换: {file_info.name}", 0)
+                    success_files.extend(convert_one(file_info))
+                except Exception as e:
+                    failed_files.append((file_info.path, str(e)))
+            return success_files, failed_files
+        
+        max_workers = min(8, os.cpu_count() or 1, total)
+        done = 0
+        # Largest-first dispatch keeps a big file from starting last and
+        # running alone at the tail of the batch
+        files = FileProcessor.sort_files_by_size_desc(files)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(convert_one, f): f for f in files}
+            for future in as_completed(futures):
+                file_info = futures[future]
+                try:
+                    success_files.extend(future.result())
+                except Exception as e:
+                    failed_files.append((file_info.path, str(e)))
+                
+                done += 1
+                progress_callback(f"正在转换: {file_info.name} ({done}/{total})", int(done / total * 100))
+                
+                if cancel_event and cancel_event.is_set():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+        
+        return success_files, failed_files
+    
+    def _prefetch(self, iterator, maxsize: int = 2):
+        """
+        Consume an iterator in a background thread through a bounded queue
+        
+        Used to pipeline PDF conversion: page N+1 rasterizes while page N
+        is being encoded and written, so wall time trends toward the
+        slower of the two stages instead of their sum. The small queue
+        bound caps how many decoded pages sit in memory, and the producer
+        stops promptly if the consumer abandons the generator.
+        """
+        q = queue.Queue(maxsize=maxsize)
+        done = object()
+        stop = threading.Event()
+        
+        def put(item):
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                for item in iterator:
+                    if not put(item):
+                        return
+                put(done)
+            except Exception as e:
+                put(e)
+        
+        threading.Thread(target=produce, daemon=True).start()
+        try:
+            while True:
+                item = q.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+    
+    def _iter_pdf_pages(self, path: str, dpi: int, fmt: str = 'jpeg'):
+        """
+        Yield (index, page_count, image) for each page of a PDF
+        
+        With PyMuPDF the pages are rendered in-process one at a time, so
+        peak memory stays at a single page instead of the whole document
+        and no Poppler subprocess or temp files are involved. pdf2image
+        remains as a fallback when PyMuPDF is not installed.
+        """
+        if HAS_PYMUPDF:
+            doc = fitz.open(path)
+            try:
+                total = doc.page_count
+                for i in range(total):
+                    page = doc.load_page(i)
+                    rect = page.rect
+                    pix = page.get_pixmap(dpi=_clamp_dpi(dpi, rect.width, rect.height), alpha=False)
+                    image = Image.frombytes('RGB', (pix.width, pix.height), pix.samples)
+                    pix = None
+                    yield i, total, image
+            finally:
+                doc.close()
+        else:
+            try:
+                size = pdfinfo_from_path(path).get('Page size', '').split()
+                dpi = _clamp_dpi(dpi, float(size[0]), float(size[2]))
+            except Exception:
+                pass
+            
+            # thread_count parallelizes Poppler's own rendering across
+            # pages, and pdftocairo outruns pdftoppm on modern Poppler.
+            # paths_only keeps one decoded page in memory at a time with
+            # the rendered pages parked in _TMP (RAM-backed when possible)
+            page_paths = convert_from_path(
+                path, dpi=dpi, fmt=fmt,
+                thread_count=min(8, os.cpu_count() or 1),
+                use_pdftocairo=True,
+                output_folder=_TMP,
+                paths_only=True
+            )
+            total = len(page_paths)
+            for i, page_path in enumerate(page_paths):
+                image = Image.open(page_path)
+                image.load()
+                try:
+                    os.remove(page_path)
+                except OSError:
+                    pass
+                yield i, total, image
+    
     def _group_files_by_format(self, files: List[FileInfo]) -> Dict[str, List[FileInfo]]:
         """Group files by their format type"""
         groups = {}
@@ -228,6 +546,47 @@ class ConversionEngine:
             groups[fmt].append(f)
         return groups
     
+    def _merge_to_pdf(self, image_sources: List, output_path: str):
+        """
+        Merge image files into one PDF, preserving img2pdf's fast path
+
+        img2pdf embeds conforming JPEG/PNG/TIFF bytestreams directly
+        with no decode, which is the whole speed advantage of this path.
+        If the batch is rejected (CMYK, 16-bit, an ICC profile or
+        compression it dislikes), only the offending sources are decoded
+        with Pillow and re-encoded to JPEG in memory, then the merge is
+        retried — conforming inputs still stream. Entries may be file
+        paths or raw image bytes. A failed merge never leaves a
+        partially written PDF behind.
+        """
+        try:
+            with open(output_path, "wb") as f:
+                img2pdf.convert(image_sources, outputstream=f)
+            return
+        except Exception:
+            pass
+
+        try:
+            sources = []
+            for src in image_sources:
+                try:
+                    img2pdf.convert([src])
+                    sources.append(src)
+                except Exception:
+                    with Image.open(BytesIO(src) if isinstance(src, bytes) else src) as img:
+                        buf = BytesIO()
+                        _as_rgb(img).save(buf, 'JPEG', quality=JPEG_QUALITY)
+                        sources.append(buf.getvalue())
+
+            with open(output_path, "wb") as f:
+                img2pdf.convert(sources, outputstream=f)
+        except Exception:
+            try:
+                os.remove(output_path)
+            except OSError:
+                pass
+            raise
+    
     def _pdf_to_jpg(
         self,
         files: List[FileInfo],
@@ -235,43 +594,32 @@ class ConversionEngine:
         dpi: int,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert PDF to JPG"""
-        success_files = []
-        failed_files = []
+        single = len(files) == 1
+        
+        check_cancel = cancel_event.is_set if cancel_event is not None else (lambda: False)
         
-        for file_info in files:
-            if cancel_event and cancel_event.is_set():
-                break
+        def convert_one(file_info: FileInfo) -> List[str]:
+            outputs = []
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
             
-            try:
-                base_name = os.path.splitext(file_info.name)[0]
-                progress_callback(f"正在转换: {file_info.name}", 0)
+            for i, total_pages, image in self._prefetch(self._iter_pdf_pages(file_info.path, dpi, fmt='jpeg')):
+                if (i & 0x7) == 0 and check_cancel():
+                    break
                 
-                images = convert_from_path(
-                    file_info.path,
-                    dpi=dpi,
-                    fmt='jpeg'
-                )
+                output_path = f"{prefix}{base_name}_{i+1}.jpg"
+                image.save(output_path, 'JPEG', quality=JPEG_QUALITY, optimize=OPTIMIZE_OUTPUT, progressive=JPEG_PROGRESSIVE)
+                outputs.append(output_path)
                 
-                total_pages = len(images)
-                for i, image in enumerate(images):
-                    if cancel_event and cancel_event.is_set():
-                        break
-                    
-                    output_filename = f"{base_name}_{i+1}.jpg"
-                    output_path = os.path.join(output_dir, output_filename)
-                    
-                    image.save(output_path, 'JPEG', quality=JPEG_QUALITY)
-                    success_files.append(output_path)
-                    
+                if single:
                     progress = int((i + 1) / total_pages * 100)
                     progress_callback(f"正在转换: {file_info.name} ({i+1}/{total_pages})", progress)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            
+            return outputs
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
     
     def _pdf_to_tiff(
         self,
@@ -279,46 +627,32 @@ class ConversionEngine:
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert PDF to TIFF"""
-        success_files = []
-        failed_files = []
+        single = len(files) == 1
         
-        for file_info in files:
-            if cancel_event and cancel_event.is_set():
-                break
+        check_cancel = cancel_event.is_set if cancel_event is not None else (lambda: False)
+        
+        def convert_one(file_info: FileInfo) -> List[str]:
+            outputs = []
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
             
-            try:
-                base_name = os.path.splitext(file_info.name)[0]
-                progress_callback(f"正在转换: {file_info.name}", 0)
+            for i, total_pages, image in self._prefetch(self._iter_pdf_pages(file_info.path, 200, fmt='tiff')):
+                if (i & 0x7) == 0 and check_cancel():
+                    break
                 
-                images = convert_from_path(
-                    file_info.path,
-                    fmt='tiff'
-                )
+                output_path = f"{prefix}{base_name}_{i+1}.tif"
+                _save_tiff(image, output_path)
+                outputs.append(output_path)
                 
-                total_pages = len(images)
-                for i, image in enumerate(images):
-                    if cancel_event and cancel_event.is_set():
-                        break
-                    
-                    output_filename = f"{base_name}_{i+1}.tif"
-                    output_path = os.path.join(output_dir, output_filename)
-                    
-                    image.save(
-                        output_path,
-                        'TIFF',
-                        compression=TIFF_COMPRESSION
-                    )
-                    success_files.append(output_path)
-                    
+                if single:
                     progress = int((i + 1) / total_pages * 100)
                     progress_callback(f"正在转换: {file_info.name} ({i+1}/{total_pages})", progress)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            
+            return outputs
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
     
     def _jpg_to_pdf(
         self,
@@ -326,7 +660,7 @@ class ConversionEngine:
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert JPG to PDF"""
         success_files = []
         failed_files = []
@@ -334,16 +668,14 @@ class ConversionEngine:
         try:
             progress_callback("正在合并JPG文件...", 0)
             
-            sorted_files = sorted(files, key=lambda x: x.name)
+            sorted_files = sorted(files, key=lambda x: _nat_key(x.name))
             image_paths = [f.path for f in sorted_files]
             
-            output_filename = f"output_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_filename = f"output_{ts}.pdf"
             output_path = os.path.join(output_dir, output_filename)
             
-            pdf_bytes = img2pdf.convert(image_paths)
-            
-            with open(output_path, "wb") as f:
-                f.write(pdf_bytes)
+            self._merge_to_pdf(image_paths, output_path)
             
             success_files.append(output_path)
             progress_callback("转换完成", 100)
@@ -357,41 +689,32 @@ class ConversionEngine:
         self,
         files: List[FileInfo],
         output_dir: str,
+        dpi: int,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert JPG to TIFF"""
-        success_files = []
-        failed_files = []
-        
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+        def convert_one(file_info: FileInfo) -> List[str]:
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
+            output_path = f"{prefix}{base_name}.tif"
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
+            with Image.open(file_info.path) as img:
+                # libjpeg can decode directly at 1/2, 1/4 or 1/8 size via
+                # IDCT scaling; when the source declares a higher DPI than
+                # the target, draft() skips decoding pixels that would
+                # only be thrown away. No-op for non-JPEG or same-scale.
+                if img.format == 'JPEG':
+                    src_dpi = int((img.info.get('dpi') or (0,))[0])
+                    if dpi and src_dpi > dpi:
+                        scale = max(1, src_dpi // dpi)
+                        img.draft('RGB', (img.size[0] // scale, img.size[1] // scale))
                 
-                base_name = os.path.splitext(file_info.name)[0]
-                output_filename = f"{base_name}.tif"
-                output_path = os.path.join(output_dir, output_filename)
-                
-                with Image.open(file_info.path) as img:
-                    if img.mode == 'RGBA':
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        background.paste(img, mask=img.split()[3])
-                        img = background
-                    elif img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    
-                    img.save(output_path, 'TIFF', compression=TIFF_COMPRESSION)
-                
-                success_files.append(output_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+                _save_tiff(img, output_path)
+            
+            return [output_path]
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
     
     def _tiff_to_pdf(
         self,
@@ -399,7 +722,7 @@ class ConversionEngine:
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert TIFF to PDF"""
         success_files = []
         failed_files = []
@@ -407,60 +730,46 @@ class ConversionEngine:
         try:
             progress_callback("正在合并TIFF文件...", 0)
             
-            sorted_files = sorted(files, key=lambda x: x.name)
-            image_paths = []
+            sorted_files = sorted(files, key=lambda x: _nat_key(x.name))
+            sources = []
             
             for file_info in sorted_files:
                 try:
                     with Image.open(file_info.path) as img:
-                        if hasattr(img, 'n_frames') and img.n_frames > 1:
-                            for page in range(img.n_frames):
-                                img.seek(page)
-                                page_path = os.path.join(
-                                    output_dir,
-                                    f"_temp_page_{len(image_paths)}.jpg"
-                                )
-                                img.save(page_path, 'JPEG', quality=JPEG_QUALITY)
-                                image_paths.append(page_path)
-                        else:
-                            page_path = os.path.join(
-                                output_dir,
-                                f"_temp_page_{len(image_paths)}.jpg"
-                            )
-                            if img.mode == 'RGBA':
-                                background = Image.new('RGB', img.size, (255, 255, 255))
-                                background.paste(img, mask=img.split()[3])
-                                background.save(page_path, 'JPEG', quality=JPEG_QUALITY)
-                            else:
-                                img.convert('RGB').save(page_path, 'JPEG', quality=JPEG_QUALITY)
-                            image_paths.append(page_path)
+                        if img.mode != 'RGBA':
+                            # img2pdf embeds TIFF pages (including multi-frame
+                            # files) directly, with no decode or re-encode
+                            sources.append(file_info.path)
+                            continue
+                        
+                        # img2pdf refuses alpha channels; flatten each page
+                        # onto white and hand it over losslessly in memory
+                        for frame in ImageSequence.Iterator(img):
+                            buf = BytesIO()
+                            _flatten_rgba(frame).save(buf, 'TIFF', compression='tiff_deflate')
+                            sources.append(buf.getvalue())
                 except Exception as e:
                     failed_files.append((file_info.path, str(e)))
             
-            if image_paths:
-                output_filename = f"output_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            if sources:
+                ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+                output_filename = f"output_{ts}.pdf"
                 output_path = os.path.join(output_dir, output_filename)
-                
-                pdf_bytes = img2pdf.convert(image_paths)
-                
-                with open(output_path, "wb") as f:
-                    f.write(pdf_bytes)
-                
+
+                # Per-source probe/re-encode fallback: one exotic TIFF
+                # (16-bit, CMYK, a compression img2pdf rejects) gets
+                # re-encoded alone instead of failing the whole merge
+                self._merge_to_pdf(sources, output_path)
+
                 success_files.append(output_path)
-                
-                for temp_path in image_paths:
-                    try:
-                        os.remove(temp_path)
-                    except:
-                        pass
-            
+
             progress_callback("转换完成", 100)
-            
+
         except Exception as e:
             failed_files.append(("", str(e)))
-        
+
         return success_files, failed_files
-    
+
     def _tiff_to_jpg(
         self,
         files: List[FileInfo],
@@ -468,57 +777,35 @@ class ConversionEngine:
         dpi: int,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert TIFF to JPG"""
-        success_files = []
-        failed_files = []
+        def save_frame(img, output_path):
+            _as_rgb(img).save(output_path, 'JPEG', quality=JPEG_QUALITY, optimize=OPTIMIZE_OUTPUT, progressive=JPEG_PROGRESSIVE)
         
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+        check_cancel = cancel_event.is_set if cancel_event is not None else (lambda: False)
+        
+        def convert_one(file_info: FileInfo) -> List[str]:
+            outputs = []
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
-                
-                base_name = os.path.splitext(file_info.name)[0]
-                
-                with Image.open(file_info.path) as img:
-                    if hasattr(img, 'n_frames') and img.n_frames > 1:
-                        for page in range(img.n_frames):
-                            if cancel_event and cancel_event.is_set():
-                                break
-                            
-                            img.seek(page)
-                            
-                            output_filename = f"{base_name}_{page+1}.jpg"
-                            output_path = os.path.join(output_dir, output_filename)
-                            
-                            if img.mode == 'RGBA':
-                                background = Image.new('RGB', img.size, (255, 255, 255))
-                                background.paste(img, mask=img.split()[3])
-                                background.save(output_path, 'JPEG', quality=JPEG_QUALITY)
-                            else:
-                                img.convert('RGB').save(output_path, 'JPEG', quality=JPEG_QUALITY)
-                            
-                            success_files.append(output_path)
-                    else:
-                        output_filename = f"{base_name}.jpg"
-                        output_path = os.path.join(output_dir, output_filename)
-                        
-                        if img.mode == 'RGBA':
-                            background = Image.new('RGB', img.size, (255, 255, 255))
-                            background.paste(img, mask=img.split()[3])
-                            background.save(output_path, 'JPEG', quality=JPEG_QUALITY)
-                        else:
-                            img.convert('RGB').save(output_path, 'JPEG', quality=JPEG_QUALITY)
-                        
-                        success_files.append(output_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            with Image.open(file_info.path) as img:
+                # ImageSequence walks the frames linearly; seek(page)
+                # re-parses IFDs from frame 0 each call, which is O(N^2)
+                # over a multi-page TIFF
+                multi = getattr(img, 'n_frames', 1) > 1
+                for page, frame in enumerate(ImageSequence.Iterator(img)):
+                    if (page & 0x7) == 0 and check_cancel():
+                        break
+                    
+                    suffix = f"_{page+1}" if multi else ""
+                    output_path = f"{prefix}{base_name}{suffix}.jpg"
+                    save_frame(frame, output_path)
+                    outputs.append(output_path)
+            
+            return outputs
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
     
     def _pdf_to_png(
         self,
@@ -527,43 +814,32 @@ class ConversionEngine:
         dpi: int,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert PDF to PNG"""
-        success_files = []
-        failed_files = []
+        single = len(files) == 1
+        
+        check_cancel = cancel_event.is_set if cancel_event is not None else (lambda: False)
         
-        for file_info in files:
-            if cancel_event and cancel_event.is_set():
-                break
+        def convert_one(file_info: FileInfo) -> List[str]:
+            outputs = []
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
             
-            try:
-                base_name = os.path.splitext(file_info.name)[0]
-                progress_callback(f"正在转换: {file_info.name}", 0)
+            for i, total_pages, image in self._prefetch(self._iter_pdf_pages(file_info.path, dpi, fmt='png')):
+                if (i & 0x7) == 0 and check_cancel():
+                    break
                 
-                images = convert_from_path(
-                    file_info.path,
-                    dpi=dpi,
-                    fmt='png'
-                )
+                output_path = f"{prefix}{base_name}_{i+1}.png"
+                image.save(output_path, 'PNG', optimize=OPTIMIZE_OUTPUT, compress_level=PNG_COMPRESS_LEVEL)
+                outputs.append(output_path)
                 
-                total_pages = len(images)
-                for i, image in enumerate(images):
-                    if cancel_event and cancel_event.is_set():
-                        break
-                    
-                    output_filename = f"{base_name}_{i+1}.png"
-                    output_path = os.path.join(output_dir, output_filename)
-                    
-                    image.save(output_path, 'PNG')
-                    success_files.append(output_path)
-                    
+                if single:
                     progress = int((i + 1) / total_pages * 100)
                     progress_callback(f"正在转换: {file_info.name} ({i+1}/{total_pages})", progress)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            
+            return outputs
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
     
     def _jpg_to_png(
         self,
@@ -571,68 +847,19 @@ class ConversionEngine:
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert JPG to PNG"""
-        success_files = []
-        failed_files = []
-        
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+        def convert_one(file_info: FileInfo) -> List[str]:
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
+            output_path = f"{prefix}{base_name}.png"
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
-                
-                base_name = os.path.splitext(file_info.name)[0]
-                output_filename = f"{base_name}.png"
-                output_path = os.path.join(output_dir, output_filename)
-                
-                with Image.open(file_info.path) as img:
-                    img.save(output_path, 'PNG')
-                
-                success_files.append(output_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
-        
-        return success_files, failed_files
-    
-    def _jpg_to_svg(
-        self,
-        files: List[FileInfo],
-        output_dir: str,
-        progress_callback: Callable,
-        cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
-        """Convert JPG to SVG"""
-        success_files = []
-        failed_files = []
-        
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+            with Image.open(file_info.path) as img:
+                img.save(output_path, 'PNG', optimize=OPTIMIZE_OUTPUT, compress_level=PNG_COMPRESS_LEVEL)
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
-                
-                base_name = os.path.splitext(file_info.name)[0]
-                output_filename = f"{base_name}.svg"
-                output_path = os.path.join(output_dir, output_filename)
-                
-                # Simplified SVG conversion
-                with Image.open(file_info.path) as img:
-                    # This is a placeholder - actual SVG conversion would require more complex logic
-                    # For now, we'll convert to PNG as a fallback
-                    png_path = output_path.replace('.svg', '.png')
-                    img.save(png_path, 'PNG')
-                    success_files.append(png_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            return [output_path]
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
     
     def _png_to_pdf(
         self,
@@ -640,7 +867,7 @@ class ConversionEngine:
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert PNG to PDF"""
         success_files = []
         failed_files = []
@@ -648,16 +875,14 @@ class ConversionEngine:
         try:
             progress_callback("正在合并PNG文件...", 0)
             
-            sorted_files = sorted(files, key=lambda x: x.name)
+            sorted_files = sorted(files, key=lambda x: _nat_key(x.name))
             image_paths = [f.path for f in sorted_files]
             
-            output_filename = f"output_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+            output_filename = f"output_{ts}.pdf"
             output_path = os.path.join(output_dir, output_filename)
             
-            pdf_bytes = img2pdf.convert(image_paths)
-            
-            with open(output_path, "wb") as f:
-                f.write(pdf_bytes)
+            self._merge_to_pdf(image_paths, output_path)
             
             success_files.append(output_path)
             progress_callback("转换完成", 100)
@@ -673,37 +898,19 @@ class ConversionEngine:
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert PNG to JPG"""
-        success_files = []
-        failed_files = []
-        
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+        def convert_one(file_info: FileInfo) -> List[str]:
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
+            output_path = f"{prefix}{base_name}.jpg"
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
-                
-                base_name = os.path.splitext(file_info.name)[0]
-                output_filename = f"{base_name}.jpg"
-                output_path = os.path.join(output_dir, output_filename)
-                
-                with Image.open(file_info.path) as img:
-                    if img.mode == 'RGBA':
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        background.paste(img, mask=img.split()[3])
-                        background.save(output_path, 'JPEG', quality=JPEG_QUALITY)
-                    else:
-                        img.convert('RGB').save(output_path, 'JPEG', quality=JPEG_QUALITY)
-                
-                success_files.append(output_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            with Image.open(file_info.path) as img:
+                _as_rgb(img).save(output_path, 'JPEG', quality=JPEG_QUALITY, optimize=OPTIMIZE_OUTPUT, progressive=JPEG_PROGRESSIVE)
+            
+            return [output_path]
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
     
     def _png_to_tiff(
         self,
@@ -711,73 +918,19 @@ class ConversionEngine:
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert PNG to TIFF"""
-        success_files = []
-        failed_files = []
-        
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+        def convert_one(file_info: FileInfo) -> List[str]:
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
+            output_path = f"{prefix}{base_name}.tif"
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
-                
-                base_name = os.path.splitext(file_info.name)[0]
-                output_filename = f"{base_name}.tif"
-                output_path = os.path.join(output_dir, output_filename)
-                
-                with Image.open(file_info.path) as img:
-                    if img.mode == 'RGBA':
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        background.paste(img, mask=img.split()[3])
-                        background.save(output_path, 'TIFF', compression=TIFF_COMPRESSION)
-                    else:
-                        img.convert('RGB').save(output_path, 'TIFF', compression=TIFF_COMPRESSION)
-                
-                success_files.append(output_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
-        
-        return success_files, failed_files
-    
-    def _png_to_svg(
-        self,
-        files: List[FileInfo],
-        output_dir: str,
-        progress_callback: Callable,
-        cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
-        """Convert PNG to SVG"""
-        success_files = []
-        failed_files = []
-        
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+            with Image.open(file_info.path) as img:
+                _save_tiff(img, output_path)
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
-                
-                base_name = os.path.splitext(file_info.name)[0]
-                output_filename = f"{base_name}.svg"
-                output_path = os.path.join(output_dir, output_filename)
-                
-                # Simplified SVG conversion
-                with Image.open(file_info.path) as img:
-                    # This is a placeholder - actual SVG conversion would require more complex logic
-                    # For now, we'll convert to PNG as a fallback
-                    png_path = output_path.replace('.svg', '.png')
-                    img.save(png_path, 'PNG')
-                    success_files.append(png_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            return [output_path]
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
     
     def _tiff_to_png(
         self,
@@ -785,98 +938,72 @@ class ConversionEngine:
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert TIFF to PNG"""
-        success_files = []
-        failed_files = []
+        def save_frame(img, output_path):
+            _as_rgb(img).save(output_path, 'PNG', optimize=OPTIMIZE_OUTPUT, compress_level=PNG_COMPRESS_LEVEL)
         
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+        check_cancel = cancel_event.is_set if cancel_event is not None else (lambda: False)
+        
+        def convert_one(file_info: FileInfo) -> List[str]:
+            outputs = []
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
-                
-                base_name = os.path.splitext(file_info.name)[0]
-                
-                with Image.open(file_info.path) as img:
-                    if hasattr(img, 'n_frames') and img.n_frames > 1:
-                        for page in range(img.n_frames):
-                            if cancel_event and cancel_event.is_set():
-                                break
-                            
-                            img.seek(page)
-                            
-                            output_filename = f"{base_name}_{page+1}.png"
-                            output_path = os.path.join(output_dir, output_filename)
-                            
-                            if img.mode == 'RGBA':
-                                background = Image.new('RGB', img.size, (255, 255, 255))
-                                background.paste(img, mask=img.split()[3])
-                                background.save(output_path, 'PNG')
-                            else:
-                                img.convert('RGB').save(output_path, 'PNG')
-                            
-                            success_files.append(output_path)
-                    else:
-                        output_filename = f"{base_name}.png"
-                        output_path = os.path.join(output_dir, output_filename)
-                        
-                        if img.mode == 'RGBA':
-                            background = Image.new('RGB', img.size, (255, 255, 255))
-                            background.paste(img, mask=img.split()[3])
-                            background.save(output_path, 'PNG')
-                        else:
-                            img.convert('RGB').save(output_path, 'PNG')
-                        
-                        success_files.append(output_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            with Image.open(file_info.path) as img:
+                # ImageSequence walks the frames linearly; seek(page)
+                # re-parses IFDs from frame 0 each call, which is O(N^2)
+                # over a multi-page TIFF
+                multi = getattr(img, 'n_frames', 1) > 1
+                for page, frame in enumerate(ImageSequence.Iterator(img)):
+                    if (page & 0x7) == 0 and check_cancel():
+                        break
+                    
+                    suffix = f"_{page+1}" if multi else ""
+                    output_path = f"{prefix}{base_name}{suffix}.png"
+                    save_frame(frame, output_path)
+                    outputs.append(output_path)
+            
+            return outputs
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
     
-    def _tiff_to_svg(
+    def _raster_to_svg(
         self,
         files: List[FileInfo],
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
-        """Convert TIFF to SVG"""
-        success_files = []
-        failed_files = []
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        Vectorize raster images to SVG
         
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+        Uses vtracer when installed (multithreaded polygon fitting that
+        writes SVG directly). Without it the files fail with a clear
+        message instead of silently saving a PNG under an .svg name as
+        the old placeholder did.
+        """
+        def convert_one(file_info: FileInfo) -> List[str]:
+            if not HAS_VTRACER:
+                raise RuntimeError("SVG输出需要可选依赖vtracer, 请运行: pip install vtracer")
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
-                
-                base_name = os.path.splitext(file_info.name)[0]
-                output_filename = f"{base_name}.svg"
-                output_path = os.path.join(output_dir, output_filename)
-                
-                # Simplified SVG conversion
-                with Image.open(file_info.path) as img:
-                    # This is a placeholder - actual SVG conversion would require more complex logic
-                    # For now, we'll convert to PNG as a fallback
-                    png_path = output_path.replace('.svg', '.png')
-                    if img.mode == 'RGBA':
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        background.paste(img, mask=img.split()[3])
-                        background.save(png_path, 'PNG')
-                    else:
-                        img.convert('RGB').save(png_path, 'PNG')
-                    success_files.append(png_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
+            output_path = f"{prefix}{base_name}.svg"
+            
+            vtracer.convert_image_to_svg_py(
+                file_info.path, output_path,
+                colormode='color', mode='polygon', filter_speckle=4
+            )
+            return [output_path]
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
+    
+    def _render_svg(self, path: str, dpi: int = DEFAULT_DPI) -> Image.Image:
+        """Render an SVG to a PIL image in memory via cairosvg"""
+        if not HAS_CAIROSVG:
+            raise RuntimeError("SVG转换需要可选依赖cairosvg, 请运行: pip install cairosvg")
+        return Image.open(BytesIO(cairosvg.svg2png(url=path, dpi=dpi)))
     
     def _svg_to_pdf(
         self,
@@ -884,47 +1011,39 @@ class ConversionEngine:
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert SVG to PDF"""
         success_files = []
         failed_files = []
+        check_cancel = cancel_event.is_set if cancel_event is not None else (lambda: False)
         
         try:
             progress_callback("正在处理SVG文件...", 0)
             
-            # Convert SVG files to PNG first, then to PDF
-            temp_files = []
-            
-            for file_info in files:
-                if cancel_event and cancel_event.is_set():
+            sources = []
+            for file_info in sorted(files, key=lambda x: _nat_key(x.name)):
+                if check_cancel():
                     break
                 
                 try:
-                    base_name = os.path.splitext(file_info.name)[0]
-                    temp_png = os.path.join(output_dir, f"temp_{base_name}.png")
-                    
-                    # Placeholder for SVG to PNG conversion
-                    # In a real implementation, you would use a library like cairosvg
-                    temp_files.append(temp_png)
-                    
+                    # Rasterize in memory and hand flattened JPEG bytes to
+                    # img2pdf; no temp files touch the disk
+                    img = self._render_svg(file_info.path)
+                    buf = BytesIO()
+                    _as_rgb(img).save(buf, 'JPEG', quality=JPEG_QUALITY)
+                    sources.append(buf.getvalue())
                 except Exception as e:
                     failed_files.append((file_info.path, str(e)))
             
-            if temp_files:
-                output_filename = f"output_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            if sources:
+                ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+                output_filename = f"output_{ts}.pdf"
                 output_path = os.path.join(output_dir, output_filename)
                 
-                # This is a placeholder - actual implementation would use the temp PNG files
                 with open(output_path, "wb") as f:
-                    f.write(b"")  # Empty PDF as placeholder
+                    img2pdf.convert(sources, outputstream=f)
                 
                 success_files.append(output_path)
-                
-                for temp in temp_files:
-                    try:
-                        os.remove(temp)
-                    except:
-                        pass
             
             progress_callback("转换完成", 100)
             
@@ -940,34 +1059,19 @@ class ConversionEngine:
         dpi: int,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert SVG to JPG"""
-        success_files = []
-        failed_files = []
-        
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+        def convert_one(file_info: FileInfo) -> List[str]:
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
+            output_path = f"{prefix}{base_name}.jpg"
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
-                
-                base_name = os.path.splitext(file_info.name)[0]
-                output_filename = f"{base_name}.jpg"
-                output_path = os.path.join(output_dir, output_filename)
-                
-                # Simplified SVG to JPG conversion
-                # This is a placeholder - actual implementation would use a library like cairosvg
-                with open(output_path, "wb") as f:
-                    f.write(b"")  # Empty file as placeholder
-                
-                success_files.append(output_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            img = self._render_svg(file_info.path, dpi)
+            _as_rgb(img).save(output_path, 'JPEG', quality=JPEG_QUALITY, optimize=OPTIMIZE_OUTPUT, progressive=JPEG_PROGRESSIVE)
+            
+            return [output_path]
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
     
     def _svg_to_png(
         self,
@@ -975,34 +1079,19 @@ class ConversionEngine:
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert SVG to PNG"""
-        success_files = []
-        failed_files = []
-        
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+        def convert_one(file_info: FileInfo) -> List[str]:
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
+            output_path = f"{prefix}{base_name}.png"
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
-                
-                base_name = os.path.splitext(file_info.name)[0]
-                output_filename = f"{base_name}.png"
-                output_path = os.path.join(output_dir, output_filename)
-                
-                # Simplified SVG to PNG conversion
-                # This is a placeholder - actual implementation would use a library like cairosvg
-                with open(output_path, "wb") as f:
-                    f.write(b"")  # Empty file as placeholder
-                
-                success_files.append(output_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            self._render_svg(file_info.path).save(
+                output_path, 'PNG', optimize=OPTIMIZE_OUTPUT, compress_level=PNG_COMPRESS_LEVEL
+            )
+            return [output_path]
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
     
     def _svg_to_tiff(
         self,
@@ -1010,39 +1099,24 @@ class ConversionEngine:
         output_dir: str,
         progress_callback: Callable,
         cancel_event: threading.Event
-    ) -> Tuple[List[str], List[str]]:
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
         """Convert SVG to TIFF"""
-        success_files = []
-        failed_files = []
-        
-        total = len(files)
-        for i, file_info in enumerate(files):
-            if cancel_event and cancel_event.is_set():
-                break
+        def convert_one(file_info: FileInfo) -> List[str]:
+            base_name = os.path.splitext(file_info.name)[0]
+            prefix = output_dir.rstrip(os.sep) + os.sep
+            output_path = f"{prefix}{base_name}.tif"
             
-            try:
-                progress_callback(f"正在转换: {file_info.name}", int((i / total) * 100))
-                
-                base_name = os.path.splitext(file_info.name)[0]
-                output_filename = f"{base_name}.tif"
-                output_path = os.path.join(output_dir, output_filename)
-                
-                # Simplified SVG to TIFF conversion
-                # This is a placeholder - actual implementation would use a library like cairosvg
-                with open(output_path, "wb") as f:
-                    f.write(b"")  # Empty file as placeholder
-                
-                success_files.append(output_path)
-                
-            except Exception as e:
-                failed_files.append((file_info.path, str(e)))
+            img = self._render_svg(file_info.path)
+            _save_tiff(img, output_path)
+            
+            return [output_path]
         
-        return success_files, failed_files
+        return self._run_per_file(files, convert_one, progress_callback, cancel_event)
 
 
 class ConversionWorker(threading.Thread):
     """Worker thread for running conversions"""
-    
+
     def __init__(
         self,
         files: List[FileInfo],
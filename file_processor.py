@@ -10,6 +10,7 @@ Handles file operations including:
 
 import os
 import sys
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 
@@ -18,24 +19,76 @@ from config import (
     THUMBNAIL_SIZE, MIN_DPI, MAX_DPI
 )
 
+# Extension lookup tables; one dict hit replaces an if/elif chain of
+# list-membership tests run per file in sort/validate/display loops
+_EXT_TO_FORMAT = {
+    '.pdf': 'pdf',
+    '.jpg': 'jpg', '.jpeg': 'jpg',
+    '.png': 'png',
+    '.tif': 'tiff', '.tiff': 'tiff',
+    '.svg': 'svg'
+}
+
+_EXT_PRIORITY = {'.pdf': 0, '.jpg': 1, '.jpeg': 1, '.tif': 2, '.tiff': 2}
+
+_EXT_TO_FORMAT_NAME = {
+    ext: SUPPORTED_FORMATS[ftype][0] for ext, ftype in _EXT_TO_FORMAT.items()
+}
+
+# Magic-byte signatures used to validate content without reading whole files
+FORMAT_SIGNATURES = {
+    'pdf': (b'%PDF-',),
+    'jpg': (b'\xff\xd8\xff',),
+    'png': (b'\x89PNG',),
+    'tiff': (b'II*\x00', b'MM\x00*'),
+    # <! covers a leading <!DOCTYPE svg ...> or <!-- comment -->
+    'svg': (b'<?xml', b'<svg', b'<!')
+}
+
 
 class FileInfo:
     """Container for file information"""
     
+    # Batches can reach tens of thousands of instances; slots drop the
+    # per-object dict (~300 B each) and tighten attribute access
+    __slots__ = ('path', 'name', 'ext', '_size', '_format_type')
+    
     def __init__(self, file_path: str):
         self.path = file_path
         self.name = os.path.basename(file_path)
         self.ext = os.path.splitext(file_path)[1].lower()
-        self._size = None
+        # One eager stat up front; size is read repeatedly by sorting,
+        # aggregation and display, and the lazy getsize cost a syscall
+        # plus a None check per access site
+        try:
+            self._size = os.stat(file_path).st_size
+        except OSError:
+            self._size = 0
+        self._format_type = _EXT_TO_FORMAT.get(self.ext, 'unknown')
+    
+    @classmethod
+    def from_dir_entry(cls, entry: os.DirEntry) -> 'FileInfo':
+        """
+        Build a FileInfo from an os.scandir entry
+        
+        DirEntry carries a stat cached from the directory read itself,
+        so directory imports skip the per-file stat syscall the path
+        constructor pays.
+        """
+        info = cls.__new__(cls)
+        info.path = entry.path
+        info.name = entry.name
+        info.ext = os.path.splitext(entry.name)[1].lower()
+        try:
+            info._size = entry.stat().st_size
+        except OSError:
+            info._size = 0
+        info._format_type = _EXT_TO_FORMAT.get(info.ext, 'unknown')
+        return info
     
     @property
     def size(self) -> int:
         """Get file size in bytes"""
-        if self._size is None:
-            try:
-                self._size = os.path.getsize(self.path)
-            except OSError:
-                self._size = 0
         return self._size
     
     @property
@@ -51,25 +104,12 @@ class FileInfo:
     @property
     def format_type(self) -> str:
         """Get the format type (pdf, jpg, png, tiff, svg)"""
-        if self.ext in ['.pdf']:
-            return 'pdf'
-        elif self.ext in ['.jpg', '.jpeg']:
-            return 'jpg'
-        elif self.ext in ['.png']:
-            return 'png'
-        elif self.ext in ['.tif', '.tiff']:
-            return 'tiff'
-        elif self.ext in ['.svg']:
-            return 'svg'
-        return 'unknown'
+        return self._format_type
     
     @property
     def format_name(self) -> str:
         """Get the format display name"""
-        fmt = self.format_type
-        if fmt in SUPPORTED_FORMATS:
-            return SUPPORTED_FORMATS[fmt][0]
-        return "未知格式"
+        return _EXT_TO_FORMAT_NAME.get(self.ext, "未知格式")
 
 
 class FileProcessor:
@@ -98,8 +138,40 @@ class FileProcessor:
         if file_size > max_size:
             return False, f"文件过大: {os.path.basename(file_path)} (最大 {MAX_FILE_SIZE_MB}MB)"
         
+        try:
+            with open(file_path, 'rb') as f:
+                header = f.read(32)
+        except OSError as e:
+            return False, f"无法读取文件: {str(e)}"
+        
+        is_valid, error_msg = FileProcessor.validate_header(header)
+        if not is_valid:
+            return False, f"文件内容无效: {os.path.basename(file_path)}"
+        
         return True, ""
     
+    @staticmethod
+    def validate_header(header: bytes) -> Tuple[bool, str]:
+        """
+        Validate file content by its magic bytes alone
+        
+        Only the first few bytes are needed, so callers can check a stream
+        or file without reading (or writing) the whole payload first.
+        
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        # Many SVG exporters write a UTF-8 BOM before the XML declaration;
+        # lstrip() only removes whitespace, not the BOM
+        if header.startswith(b'\xef\xbb\xbf'):
+            header = header[3:]
+        stripped = header.lstrip()
+        for fmt, signatures in FORMAT_SIGNATURES.items():
+            for sig in signatures:
+                if header.startswith(sig) or stripped.startswith(sig):
+                    return True, ""
+        return False, "无法识别的文件内容"
+    
     @staticmethod
     def validate_directory(dir_path: str) -> Tuple[bool, str]:
         """
@@ -127,20 +199,35 @@ class FileProcessor:
     
     @staticmethod
     def get_unique_filename(dir_path: str, base_name: str, ext: str) -> str:
-        """Generate a unique filename to avoid conflicts"""
-        filename = f"{base_name}{ext}"
-        filepath = os.path.join(dir_path, filename)
+        """
+        Claim a unique filename, atomically against parallel workers
         
-        if not os.path.exists(filepath):
-            return filepath
+        One scandir builds the set of existing names so candidates are
+        screened in memory instead of a stat syscall per probe, then the
+        winner is created with O_EXCL so two workers can never claim the
+        same name.
+        """
+        try:
+            existing = {entry.name for entry in os.scandir(dir_path)}
+        except OSError:
+            existing = set()
         
-        counter = 1
+        counter = 0
         while True:
-            filename = f"{base_name}_{counter}{ext}"
+            filename = f"{base_name}{ext}" if counter == 0 else f"{base_name}_{counter}{ext}"
+            counter += 1
+            if filename in existing:
+                continue
+            
             filepath = os.path.join(dir_path, filename)
-            if not os.path.exists(filepath):
+            try:
+                fd = os.open(filepath, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                continue
+            except OSError:
                 return filepath
-            counter += 1
+            os.close(fd)
+            return filepath
     
     @staticmethod
     def validate_dpi(dpi: int) -> Tuple[int, bool]:
@@ -180,6 +267,7 @@ class FileProcessor:
         }
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def can_convert(source_format: str, target_format: str) -> bool:
         """Check if conversion from source to target is supported"""
         if source_format == target_format:
@@ -187,13 +275,24 @@ class FileProcessor:
         return source_format in ['pdf', 'jpg', 'tiff'] and target_format in ['pdf', 'jpg', 'tiff']
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_supported_target_formats(source_format: str) -> List[str]:
         """Get list of supported target formats for a given source format"""
         all_formats = ['pdf', 'jpg', 'tiff']
         return [f for f in all_formats if f != source_format]
     
+    @staticmethod
+    def sort_files_by_size_desc(files: List[FileInfo]) -> List[FileInfo]:
+        """
+        Sort files largest-first for parallel dispatch
+        
+        Starting the biggest jobs first avoids the straggler pattern
+        where the largest file lands on a worker last and runs alone
+        while every other core sits idle.
+        """
+        return sorted(files, key=lambda f: f.size, reverse=True)
+    
     @staticmethod
     def sort_files_by_ext(files: List[FileInfo]) -> List[FileInfo]:
         """Sort files by extension for consistent ordering"""
-        ext_priority = {'.pdf': 0, '.jpg': 1, '.jpeg': 1, '.tif': 2, '.tiff': 2}
-        return sorted(files, key=lambda f: ext_priority.get(f.ext, 99))
+        return sorted(files, key=lambda f: _EXT_PRIORITY.get(f.ext, 99))
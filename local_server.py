@@ -1,29 +1,327 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, Response, send_from_directory
 from flask_cors import CORS
+import base64
+import gzip
+import hashlib
+import logging
+import mimetypes
+import orjson
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+
+# Lazy %-formatting and a DEBUG gate keep diagnostics free on the hot
+# path unless LOG_LEVEL=DEBUG is set
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'))
+logger = logging.getLogger(__name__)
+
+try:
+    from flask_compress import Compress
+    HAS_COMPRESS = True
+except ImportError:
+    HAS_COMPRESS = False
+
+# pybase64 encodes with AVX2/SSSE3/NEON — 5-20x the stdlib on the
+# multi-megabyte images the multipart path has to encode
+try:
+    import pybase64
+    _b64encode_str = pybase64.b64encode_as_string
+except ImportError:
+    def _b64encode_str(raw):
+        return base64.b64encode(raw).decode('ascii')
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 app = Flask(__name__, static_folder='.')
 CORS(app)
 
+# Reject oversize request bodies before spending CPU (or memory) on a
+# multi-megabyte JSON parse; tunable via ARK_MAX_UPLOAD_MB
+_MAX_UPLOAD_BYTES = int(os.environ.get('ARK_MAX_UPLOAD_MB', '32')) * 1024 * 1024
+app.config['MAX_CONTENT_LENGTH'] = _MAX_UPLOAD_BYTES
+
+# Compress JSON/HTML responses when flask-compress is installed; the
+# analysis descriptions and static pages are ASCII-heavy and shrink 5-10x
+if HAS_COMPRESS:
+    app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html']
+    app.config['COMPRESS_LEVEL'] = 6
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    Compress(app)
+
 API_KEY = os.environ.get('ARK_API_KEY', '483e4f2b-fe23-4ab3-a3f3-ab66c279f748')
 ENDPOINT_ID = 'ep-20260221013833-rdjh9'
+URL = 'https://ark.cn-beijing.volces.com/api/v3/responses'
+
+# Shared request headers; referenced (never mutated) by every call site
+HEADERS = {
+    'Content-Type': 'application/json',
+    'Authorization': 'Bearer ' + API_KEY
+}
+
+# One session for the process; reusing the pooled HTTPS connection skips
+# the TCP+TLS handshake that a bare requests.post pays on every call
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+))
+
+# HTTP/2 multiplexes attempts over one TLS connection and compresses the
+# repeated auth headers; needs httpx plus its h2 extra
+try:
+    import httpx
+    CLIENT = httpx.Client(
+        http2=True,
+        timeout=60.0,
+        limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+    )
+    HAS_HTTPX = True
+except ImportError:
+    CLIENT = None
+    HAS_HTTPX = False
+
+
+def _post_body(url, body, headers, timeout=60):
+    """POST a pre-serialized JSON body, over HTTP/2 when available"""
+    if HAS_HTTPX:
+        return CLIENT.post(url, content=body, headers=headers, timeout=timeout)
+    return SESSION.post(url, data=body, headers=headers, timeout=timeout, stream=True)
+
+
+# Pool for hedged variant attempts; sized for a few concurrent requests
+_POOL = ThreadPoolExecutor(max_workers=8)
+
+# How long the preferred variant may stay silent before the alternate is
+# launched alongside it; tunable via ARK_HEDGE_MS. Inference routinely
+# takes tens of seconds, so this must never cut the preferred attempt
+# short — it only decides when to start hedging.
+_HEDGE_DELAY = float(os.environ.get('ARK_HEDGE_MS', '5000')) / 1000.0
+
+
+def _close_abandoned(future):
+    """Drain a losing attempt so its socket returns to the session pool"""
+    try:
+        future.result().close()
+    except Exception:
+        pass
+
+
+def _discard_losers(futures, winner):
+    """Cancel attempts that haven't started; drain the ones in flight"""
+    for f in futures:
+        if f is not winner and not f.cancel():
+            f.add_done_callback(_close_abandoned)
+
+
+# Index of the payload variant that last succeeded (list for mutability);
+# steady state issues one upstream call instead of two per image request
+_PREFERRED_VARIANT = [0]
+
+
+# Exact-match response cache: a repeated (image, prompt) pair — common
+# in debugging and test runs — skips the upstream round-trip entirely
+_CACHE = {}
+# waitress serves requests from a thread pool; the eviction scan
+# iterates the dict and must not race an insert from another worker
+_CACHE_LOCK = threading.Lock()
+_CACHE_TTL = 3600
+_CACHE_MAX_ENTRIES = 512
+
+
+def _cache_key(image_base64, prompt):
+    """Build a deterministic cache key from the image and prompt
+
+    The base64 image is opaque forwarded content, so the key hashes the
+    base64 text itself rather than paying a multi-MB decode just to
+    fingerprint it.
+    """
+    img_hash = hashlib.sha256(image_base64.encode('ascii', 'ignore')).digest() if image_base64 else b''
+    return hashlib.sha256(img_hash + prompt.encode() + ENDPOINT_ID.encode()).hexdigest()
+
+
+def _cache_get(key):
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+    if entry and time.time() - entry[0] < _CACHE_TTL:
+        return entry[1]
+    return None
+
+
+def _cache_put(key, text):
+    with _CACHE_LOCK:
+        if len(_CACHE) >= _CACHE_MAX_ENTRIES:
+            oldest = min(_CACHE, key=lambda k: _CACHE[k][0])
+            del _CACHE[oldest]
+        _CACHE[key] = (time.time(), text)
+
+
+def _image_payloads(data_url, prompt):
+    """Build the two payload envelopes the endpoint may accept
+
+    Both dicts reference the same data_url string object, so the
+    multi-megabyte image is never copied; the envelopes themselves are a
+    handful of small dicts, cheaper to build literally than to deepcopy
+    from a template.
+    """
+    return [
+        {
+            'model': ENDPOINT_ID,
+            'input': [
+                {
+                    'role': 'user',
+                    'content': [
+                        {'type': 'image_url', 'image_url': {'url': data_url}},
+                        {'type': 'text', 'text': prompt}
+                    ]
+                }
+            ]
+        },
+        {
+            'model': ENDPOINT_ID,
+            'input': [
+                {
+                    'role': 'user',
+                    'content': [
+                        {'type': 'input_image', 'image_url': data_url},
+                        {'type': 'input_text', 'text': prompt}
+                    ]
+                }
+            ]
+        }
+    ]
+
+
+def _text_payload(prompt):
+    """Build the text-only payload"""
+    return {
+        'model': ENDPOINT_ID,
+        'input': [
+            {
+                'role': 'user',
+                'content': prompt
+            }
+        ]
+    }
+
+
+def json_response(obj, status=200):
+    """Serialize a JSON response with orjson instead of flask.jsonify"""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+
+# Static pages read, hashed and gzipped once at startup; requests are
+# answered from memory with ETag revalidation instead of per-request
+# disk reads and compression
+_STATIC_CACHE = {}
+
+
+def _load_static_cache():
+    base = os.path.dirname(os.path.abspath(__file__))
+    try:
+        entries = os.scandir(base)
+    except OSError:
+        return
+    for entry in entries:
+        if not entry.is_file() or not entry.name.endswith('.html'):
+            continue
+        try:
+            with open(entry.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            continue
+        etag = hashlib.blake2b(data).hexdigest()[:16]
+        mimetype = mimetypes.guess_type(entry.name)[0] or 'application/octet-stream'
+        _STATIC_CACHE[entry.name] = (gzip.compress(data, 6), etag, mimetype)
+
+
+_load_static_cache()
+
+
+def _serve_static(name):
+    """Serve a preloaded static file, falling back to the filesystem"""
+    cached = _STATIC_CACHE.get(name)
+    if cached is None:
+        return send_from_directory('.', name, conditional=True, max_age=300)
+
+    body_gz, etag, mimetype = cached
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304, headers={'ETag': etag, 'Vary': 'Accept-Encoding'})
+
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        resp = Response(body_gz, mimetype=mimetype)
+        resp.headers['Content-Encoding'] = 'gzip'
+    else:
+        resp = Response(gzip.decompress(body_gz), mimetype=mimetype)
+    # The same URL serves gzip or identity depending on the request, so
+    # shared caches must key on the encoding
+    resp.headers['Vary'] = 'Accept-Encoding'
+    resp.headers['ETag'] = etag
+    # Not marked immutable: the pages aren't content-hashed, so clients
+    # must still be able to revalidate by ETag after the max-age window
+    resp.headers['Cache-Control'] = 'public, max-age=86400'
+    return resp
+
+
+def _extract_text(result):
+    """Join all output_text fragments from an Ark response in one pass"""
+    return ''.join(
+        c.get('text', '')
+        for item in result.get('output') or ()
+        for c in item.get('content') or ()
+        if c.get('type') == 'output_text'
+    )
+
+
+def _read_output_text(response):
+    """Pull output_text from an upstream response
+
+    With ijson installed the body is parsed incrementally off the wire
+    so parsing overlaps the network read and the full JSON is never
+    buffered; otherwise the buffered body is parsed with orjson.
+    """
+    raw = getattr(response, 'raw', None)
+    if not HAS_IJSON or raw is None:
+        return _extract_text(orjson.loads(response.content))
+
+    raw.decode_content = True
+    parts = []
+    item_type = None
+    item_text = ''
+    for prefix, event, value in ijson.parse(raw):
+        if prefix == 'output.item.content.item.type':
+            item_type = value
+        elif prefix == 'output.item.content.item.text':
+            item_text = value
+        elif event == 'end_map' and prefix == 'output.item.content.item':
+            if item_type == 'output_text':
+                parts.append(item_text)
+            item_type = None
+            item_text = ''
+    return ''.join(parts)
 
 @app.route('/')
 def index():
-    return send_from_directory('.', 'index.html')
+    return _serve_static('index.html')
 
 @app.route('/about.html')
 def about():
-    return send_from_directory('.', 'about.html')
+    return _serve_static('about.html')
 
 @app.route('/privacy.html')
 def privacy():
-    return send_from_directory('.', 'privacy.html')
+    return _serve_static('privacy.html')
 
 @app.route('/terms.html')
 def terms():
-    return send_from_directory('.', 'terms.html')
+    return _serve_static('terms.html')
 
 @app.route('/api/analyze', methods=['POST', 'OPTIONS'])
 def analyze():
@@ -32,106 +330,130 @@ def analyze():
         response.headers['Access-Control-Allow-Origin'] = '*'
         return response
     
+    # Checked explicitly so the declared length is refused before any of
+    # the body is read or parsed
+    if request.content_length and request.content_length > _MAX_UPLOAD_BYTES:
+        return json_response({'error': 'Request body too large'}, 413)
+
     try:
-        data = request.json
-        image_base64 = data.get('image', '')
-        prompt = data.get('prompt', 'Describe this image')
-        
-        url = 'https://ark.cn-beijing.volces.com/api/v3/responses'
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': 'Bearer ' + API_KEY
-        }
+        # multipart carries the raw JPEG bytes — 25% smaller on the wire
+        # than base64-in-JSON and encoded exactly once, server-side; the
+        # JSON path stays for existing clients
+        if request.content_type and request.content_type.startswith('multipart/form-data'):
+            upload = request.files.get('image')
+            raw = upload.read() if upload else b''
+            image_base64 = _b64encode_str(raw) if raw else ''
+            prompt = request.form.get('prompt', 'Describe this image')
+        else:
+            # Parse the body with orjson directly; request.json goes
+            # through stdlib json, which is several times slower on the
+            # multi-megabyte base64 string
+            data = orjson.loads(request.get_data(cache=False) or b'{}')
+            image_base64 = data.get('image', '')
+            prompt = data.get('prompt', 'Describe this image')
         
+        cache_key = _cache_key(image_base64, prompt)
+        cached = _cache_get(cache_key)
+        if cached is not None:
+            return json_response({'description': cached})
+
         if image_base64:
-            payloads = [
-                {
-                    'model': ENDPOINT_ID,
-                    'input': [
-                        {
-                            'role': 'user',
-                            'content': [
-                                {'type': 'image_url', 'image_url': {'url': 'data:image/jpeg;base64,' + image_base64}},
-                                {'type': 'text', 'text': prompt}
-                            ]
-                        }
-                    ]
-                },
-                {
-                    'model': ENDPOINT_ID,
-                    'input': [
-                        {
-                            'role': 'user',
-                            'content': [
-                                {'type': 'input_image', 'image_url': 'data:image/jpeg;base64,' + image_base64},
-                                {'type': 'input_text', 'text': prompt}
-                            ]
-                        }
-                    ]
-                }
-            ]
-            
-            for payload in payloads:
+            # Build the multi-megabyte data URL once and serialize each
+            # payload once with orjson, instead of concatenating the
+            # base64 string per variant and letting requests re-serialize
+            # the whole dict internally
+            data_url = 'data:image/jpeg;base64,' + image_base64
+            payloads = _image_payloads(data_url, prompt)
+
+            # Hedge without cutting the preferred variant short: it
+            # keeps its full budget, and only if it stays silent past
+            # the hedge window is the alternate launched alongside it —
+            # the first usable answer wins
+            pref = _PREFERRED_VARIANT[0]
+            alt = 1 - pref
+            futures = {_POOL.submit(_post_body, URL, orjson.dumps(payloads[pref]), HEADERS): pref}
+            done, _ = wait(list(futures), timeout=_HEDGE_DELAY)
+            if not done:
+                futures[_POOL.submit(_post_body, URL, orjson.dumps(payloads[alt]), HEADERS)] = alt
+
+            schema_rejected = False
+            for future in as_completed(list(futures)):
+                idx = futures[future]
                 try:
-                    response = requests.post(url, json=payload, headers=headers, timeout=60)
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        
-                        text = ''
-                        if 'output' in result:
-                            output = result['output']
-                            if isinstance(output, list) and len(output) > 0:
-                                for item in output:
-                                    if 'content' in item:
-                                        for content_item in item['content']:
-                                            if content_item.get('type') == 'output_text':
-                                                text += content_item.get('text', '')
-                        
-                        if not text:
-                            text = str(result)
-                        
-                        return jsonify({'description': text})
-                except Exception as e:
+                    response = future.result()
+                except Exception:
+                    continue
+
+                logger.debug('variant %d status %s', idx, response.status_code)
+
+                if response.status_code == 200:
+                    text = _read_output_text(response)
+                    if text:
+                        _PREFERRED_VARIANT[0] = idx
+                        _cache_put(cache_key, text)
+                        _discard_losers(futures, future)
+                        return json_response({'description': text})
+                    response.close()
                     continue
-            
-            return jsonify({'error': 'API call failed'}), 400
+
+                # Guarded so the body slice is only allocated when DEBUG
+                # is actually enabled; content[:200] slices bytes without
+                # decoding the whole body
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug('variant %d body %s', idx, response.content[:200])
+                response.close()
+                schema_rejected = schema_rejected or response.status_code in (400, 422)
+
+            # The preferred variant was rejected on schema before the
+            # hedge window elapsed, so the alternate never started —
+            # the one case where a second upstream call can still help
+            if alt not in futures.values() and schema_rejected:
+                try:
+                    response = _post_body(URL, orjson.dumps(payloads[alt]), HEADERS)
+                    if response.status_code == 200:
+                        text = _read_output_text(response)
+                        if text:
+                            _PREFERRED_VARIANT[0] = alt
+                            _cache_put(cache_key, text)
+                            return json_response({'description': text})
+                    response.close()
+                except Exception:
+                    pass
+
+            return json_response({'error': 'API call failed'}, 400)
         else:
-            payload = {
-                'model': ENDPOINT_ID,
-                'input': [
-                    {
-                        'role': 'user',
-                        'content': prompt
-                    }
-                ]
-            }
-            
-            response = requests.post(url, json=payload, headers=headers, timeout=60)
-            
+            response = _post_body(URL, orjson.dumps(_text_payload(prompt)), HEADERS)
+
+            logger.debug('text status %s', response.status_code)
+
             if response.status_code != 200:
-                return jsonify({'error': 'API error', 'details': response.text}), response.status_code
-            
-            result = response.json()
-            
-            text = ''
-            if 'output' in result:
-                output = result['output']
-                if isinstance(output, list) and len(output) > 0:
-                    for item in output:
-                        if 'content' in item:
-                            for content_item in item['content']:
-                                if content_item.get('type') == 'output_text':
-                                    text += content_item.get('text', '')
-            
+                return json_response({'error': 'API error', 'details': response.text}, response.status_code)
+
+            text = _read_output_text(response)
+
             if not text:
-                text = str(result)
-            
-            return jsonify({'description': text})
+                # str(result) on a large multimodal response can be
+                # megabytes of repr; an explicit error is cheaper and clearer
+                return json_response({'error': 'empty output'}, 502)
+
+            _cache_put(cache_key, text)
+            return json_response({'description': text})
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}, 500)
 
 if __name__ == '__main__':
-    print('Starting server at http://localhost:5000')
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    logger.info('Starting server at http://localhost:5000')
+    # Werkzeug's dev server serializes requests; with waitress installed
+    # one slow upstream call no longer stalls every other client. For
+    # heavier concurrency the app also runs unchanged under gevent
+    # workers, where each worker multiplexes thousands of in-flight
+    # upstream waits instead of one per thread:
+    #   gunicorn -k gevent -w 4 --worker-connections 1000 local_server:app
+    try:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5000, threads=8)
+    except ImportError:
+        # debug=True would re-enable the Werkzeug debugger + reloader,
+        # roughly halving throughput; opt in via FLASK_DEBUG instead
+        app.run(host='0.0.0.0', port=5000, threaded=True)
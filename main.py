@@ -23,20 +23,23 @@ Requirements:
 import sys
 import os
 
-from PyQt5.QtWidgets import QApplication, QMessageBox
-
-from gui import MainWindow
-from config import APP_NAME, APP_VERSION
-
 
 def main():
     """Main entry point for the application"""
+    # Imported here rather than at module top so `import main` (tests,
+    # editors, tooling) doesn't pay the PyQt5 + Pillow import cost; the
+    # GUI stack only loads when the app actually launches
+    from PyQt5.QtWidgets import QApplication
+    from gui import MainWindow
+    from config import APP_NAME, APP_VERSION, STYLESHEET
+
     os.environ.setdefault('QT_QPA_PLATFORM', 'windows')
-    
+
     app = QApplication(sys.argv)
     app.setApplicationName(APP_NAME)
     app.setApplicationVersion(APP_VERSION)
-    
+    app.setStyleSheet(STYLESHEET)
+
     window = MainWindow()
     window.show()
     